@@ -4,7 +4,10 @@ FootPrint可视化主要API接口
 提供高级的FootPrint数据可视化函数，整合所有模块功能
 """
 
+import functools
 import os
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
 import matplotlib.pyplot as plt
 from Bio import SeqIO
@@ -14,6 +17,101 @@ from .data_processor import FootprintDataProcessor
 from .visualizer import FootprintVisualizer, TypeOnlyTranslator
 
 
+# 保存图片时使用的分辨率
+_OUTPUT_DPI = 300
+
+
+def _file_cache_key(path):
+    """返回文件的 (绝对路径, 修改时间) 作为缓存键，文件不存在时返回None"""
+    if path is None or not os.path.exists(path):
+        return None
+    return os.path.abspath(path), os.path.getmtime(path)
+
+
+@functools.lru_cache(maxsize=16)
+def _load_region(genome_fasta_key, gff3_key, chrom, start, end):
+    """
+    在内存中创建区域的GenBank记录并计算转录本布局，结果按输入文件的路径和修改时间缓存，
+    同一区域重复绘图（如调整高亮区域或颜色条范围）时不再重新解析
+    
+    参数:
+    - genome_fasta_key: 基因组FASTA文件的_file_cache_key（为None时以'N'序列代替）
+    - gff3_key: GFF3注释文件的 (绝对路径, 修改时间)
+    - chrom, start, end: 区域坐标 (1-based)
+    
+    返回:
+    - (record, layout): 区域的SeqRecord，以及create_transcript_layout_visualization的返回值
+      （无特征时为None）；两者在多次调用间共享，绘图时不应修改
+    """
+    genome_fasta = genome_fasta_key[0] if genome_fasta_key is not None else None
+    record = GenBankCreator().create_record_from_region(genome_fasta, gff3_key[0], chrom, start, end)
+    
+    layout = None
+    if record.features:
+        layout = FootprintVisualizer().create_transcript_layout_visualization(record)
+    return record, layout
+
+
+def _create_region_record(genome_fasta, gff3_file, chrom, start, end, genbank_file=None):
+    """
+    在内存中创建区域的GenBank记录和转录本布局，不使用临时文件
+    
+    参数:
+    - genbank_file: GenBank文件保存路径 (为None时不写入磁盘)
+    
+    返回:
+    - (record, layout): 见_load_region
+    """
+    record, layout = _load_region(
+        _file_cache_key(genome_fasta),
+        (os.path.abspath(gff3_file), os.path.getmtime(gff3_file)),
+        chrom, start, end
+    )
+    
+    if genbank_file is not None:
+        SeqIO.write(record, genbank_file, "genbank")
+        print(f"GenBank文件已保存到: {genbank_file}")
+    
+    return record, layout
+
+
+def _draw_annotation_tracks(visualizer, axes, record, layout, start, region_len):
+    """
+    绘制基因注释轨道
+    
+    参数:
+    - visualizer: FootprintVisualizer对象
+    - axes: 基因注释轨道的轴列表（多行布局时每行转录本一个轴，否则只有一个轴）
+    - record: GenBank记录对象
+    - layout: create_transcript_layout_visualization的返回值，无特征时为None
+    - start: 区域起始位置
+    - region_len: 区域长度
+    """
+    if len(axes) > 1:
+        # 多行布局：绘制每一行的转录本
+        transcript_rows, transcript_ranges, transcripts = layout
+        for ax, transcript_row in zip(axes, transcript_rows):
+            visualizer.draw_transcript_row(ax, transcript_row, transcript_ranges, transcripts, record, start, region_len=region_len)
+    else:
+        # 单行布局 - 使用相对坐标系，避免坐标值过大导致的渲染问题
+        ax = axes[0]
+        translator = TypeOnlyTranslator()
+        graphic_record = translator.translate_record(record)
+        # 不设置first_index，使用相对坐标（从0开始）
+        graphic_record.plot(ax=ax, with_ruler=False, draw_line=False, strand_in_label_threshold=4)
+        # 添加虚线连接（使用相对坐标，复用布局时已分组的转录本）
+        if layout is not None:
+            visualizer._add_intron_connections_simple(ax, layout[2], 0)
+        # 设置x轴范围为相对坐标
+        ax.set_xlim(0, len(record.seq))
+
+
+def _hide_inner_xaxes(axes):
+    """隐藏除最后一个轴以外所有轴的x轴刻度和标签（只有底部的热图轨道显示x轴）"""
+    for ax in axes[:-1]:
+        ax.xaxis.set_visible(False)
+
+
 def plot_region_with_footprints(genome_fasta, gff3_file, fp_score_file, chrom, start, end, 
                                figsize=None, highlight_regions=None, output_file=None, genbank_file=None,
                                colorbar_vmin=None, colorbar_vmax=None):
@@ -30,7 +128,7 @@ def plot_region_with_footprints(genome_fasta, gff3_file, fp_score_file, chrom, s
     - figsize: 图片大小 (如果为None则自动调整)
     - highlight_regions: 高亮区域列表 [(start1, end1), (start2, end2), ...]
     - output_file: 输出文件路径
-    - genbank_file: GenBank文件保存路径 (如果指定则不会删除该文件)
+    - genbank_file: GenBank文件保存路径 (为None时不写入磁盘)
     - colorbar_vmin: 颜色条最小值（默认None，表示自动取0）
     - colorbar_vmax: 颜色条最大值（默认None，表示自动取数据上限/全局上限）
     
@@ -39,14 +137,12 @@ def plot_region_with_footprints(genome_fasta, gff3_file, fp_score_file, chrom, s
     """
     
     # 初始化组件
-    gb_creator = GenBankCreator()
     data_processor = FootprintDataProcessor()
     visualizer = FootprintVisualizer()
     
-    # 创建GenBank文件
-    print(f"正在为区域 {chrom}:{start}-{end} 创建GenBank文件...")
-    gb_file = gb_creator.create_from_region(genome_fasta, gff3_file, chrom, start, end, genbank_file)
-    is_temp_file = genbank_file is None
+    # 创建GenBank记录（仅在指定genbank_file时写入磁盘）
+    print(f"正在为区域 {chrom}:{start}-{end} 创建GenBank记录...")
+    record, layout = _create_region_record(genome_fasta, gff3_file, chrom, start, end, genbank_file)
     
     # 参数校验：自定义颜色条范围
     if (colorbar_vmin is not None) and (colorbar_vmax is not None) and (colorbar_vmin >= colorbar_vmax):
@@ -59,108 +155,60 @@ def plot_region_with_footprints(genome_fasta, gff3_file, fp_score_file, chrom, s
     
     if fp_data.empty:
         print(f"警告: 在区域 {chrom}:{start}-{end} 中未找到footprint数据")
-        heatmap_data = np.zeros((99, end - start + 1))  # 创建空的热图数据
+        heatmap_data = np.zeros((99, end - start + 1), dtype=np.float32)  # 创建空的热图数据
         radii = np.arange(2, 101)
         max_score = 1.0  # 默认最大值
     else:
         print(f"找到 {len(fp_data)} 个footprint数据点")
         heatmap_data, positions, radii = data_processor.create_heatmap_data(fp_data, start, end)
-        raw_max = np.max(heatmap_data) if np.max(heatmap_data) > 0 else 1.0
+        raw_max = float(np.nanmax(heatmap_data))  # 只做一次全矩阵归约（忽略长格式数据中的NaN）
+        if not raw_max > 0:  # 非正数或NaN时使用默认值
+            raw_max = 1.0
         max_score = min(raw_max, 5.0)  # 限制最大值不超过5
         effective_vmin = 0.0 if colorbar_vmin is None else float(colorbar_vmin)
         effective_vmax = max_score if colorbar_vmax is None else float(colorbar_vmax)
         print(f"数据最大值: {raw_max:.3f}, colorbar范围: [{effective_vmin:.3f}, {effective_vmax:.3f}]")
     
-    # 读取GenBank记录
-    record = SeqIO.read(gb_file, "genbank")
+    # 转录本布局已随记录一起计算，按所需行数一次性创建图形
+    multi_row = layout is not None and len(layout[0]) > 1
+    
+    if multi_row:
+        # 多行布局：转录本行数 + 1个footprint热图，转录本行较矮，热图行较高
+        height_ratios = [1.2] * len(layout[0]) + [2]
+    else:
+        # 单行布局：1个基因注释轨道 + 1个footprint热图
+        height_ratios = [3, 2]
     
     # 自动调整画布大小（2个轨道：基因注释 + footprint热图）
     if figsize is None:
         figsize = visualizer._auto_figsize(2)
     
     # 创建图形
-    fig, (ax1, ax2) = plt.subplots(
-        2, 1, figsize=figsize, 
-        gridspec_kw={"height_ratios": [3, 2]}
+    fig, axes = plt.subplots(
+        len(height_ratios), 1, figsize=figsize,
+        gridspec_kw={"height_ratios": height_ratios}
     )
+    region_len = end - start + 1
     
     # 绘制基因注释图 - 使用智能布局
     print("正在绘制基因注释（使用智能布局）...")
+    _draw_annotation_tracks(visualizer, axes[:-1], record, layout, start, region_len)
     
-    # 如果记录中有特征，使用智能布局
-    if record.features:
-        transcript_rows, transcript_ranges, transcripts = visualizer.create_transcript_layout_visualization(record)
-        
-        if len(transcript_rows) > 1:
-            # 多行布局 - 重新创建子图
-            plt.close(fig)
-            
-            # 重新计算子图数量：转录本行数 + 1个footprint热图
-            total_rows = len(transcript_rows) + 1
-            height_ratios = [1.2] * len(transcript_rows) + [2]  # 转录本行较矮，热图行较高
-            
-            if figsize is None:
-                figsize = visualizer._auto_figsize(total_rows)
-            
-            fig, axes = plt.subplots(
-                total_rows, 1, figsize=figsize,
-                gridspec_kw={"height_ratios": height_ratios}
-            )
-            
-            if total_rows == 1:
-                axes = [axes]
-            
-            # 绘制每一行的转录本，隐藏所有转录本轨道的x轴标签
-            region_len = end - start + 1
-            for row_idx, transcript_row in enumerate(transcript_rows):
-                visualizer.draw_transcript_row(axes[row_idx], transcript_row, transcript_ranges, transcripts, record, start, region_len=region_len)
-                # 隐藏所有转录本轨道的x轴标签（只有最后的footprint热图轨道显示x轴标签）
-                axes[row_idx].tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-            
-            # footprint热图使用最后一个轴
-            ax2 = axes[-1]
-            
-            # 不再设置标题
-        else:
-            # 单行布局 - 使用相对坐标系，避免坐标值过大导致的渲染问题
-            translator = TypeOnlyTranslator()
-            graphic_record = translator.translate_record(record)
-            # 不设置first_index，使用相对坐标（从0开始）
-            graphic_record.plot(ax=ax1, with_ruler=False, draw_line=False, strand_in_label_threshold=4)
-            # 为单行布局添加虚线连接（使用相对坐标）
-            visualizer._add_intron_connections_simple(ax1, record, 0)
-            # 设置x轴范围为相对坐标
-            ax1.set_xlim(0, len(record.seq))
-            # 隐藏基因注释轨道的x轴标签
-            ax1.tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-    else:
-        # 没有特征，使用相对坐标系
-        translator = TypeOnlyTranslator()
-        graphic_record = translator.translate_record(record)
-        # 不设置first_index，使用相对坐标（从0开始）
-        graphic_record.plot(ax=ax1, with_ruler=False, draw_line=False, strand_in_label_threshold=4)
-        # 为无特征情况添加虚线连接（使用相对坐标）
-        visualizer._add_intron_connections_simple(ax1, record, 0)
-        # 设置x轴范围为相对坐标
-        ax1.set_xlim(0, len(record.seq))
-        # 隐藏基因注释轨道的x轴标签
-        ax1.tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-    
-    # 绘制footprint分数热图
+    # 绘制footprint分数热图（使用最后一个轴）
     print("正在绘制footprint分数热图...")
-    region_len = end - start + 1
+    ax2 = axes[-1]
     
     # 对于单行布局，热图使用相对坐标（从0开始）
-    heatmap_start = 0 if 'axes' not in locals() or len(axes) <= 2 else start
+    heatmap_start = start if multi_row else 0
     im = visualizer.plot_heatmap(
         ax2, heatmap_data, radii, region_len, max_score, heatmap_start,
-        vmin=colorbar_vmin, vmax=colorbar_vmax
+        vmin=colorbar_vmin, vmax=colorbar_vmax, dpi=_OUTPUT_DPI
     )
     ax2.set_xlabel(f"{chrom} position (bp)")
+    _hide_inner_xaxes(axes)
     
     # 添加高亮区域
-    axes_to_highlight = axes if 'axes' in locals() and len(axes) > 2 else [ax1, ax2]
-    visualizer.add_highlight_regions(axes_to_highlight, highlight_regions, start, region_len)
+    visualizer.add_highlight_regions(axes, highlight_regions, start, region_len)
     
     # 添加颜色条（右上角横置）
     cbar_ax = fig.add_axes([0.85, 0.9, 0.1, 0.03])  # [left, bottom, width, height]
@@ -172,16 +220,9 @@ def plot_region_with_footprints(genome_fasta, gff3_file, fp_score_file, chrom, s
     
     # 保存图片
     if output_file:
-        plt.savefig(output_file, dpi=300, bbox_inches='tight')
+        plt.savefig(output_file, dpi=_OUTPUT_DPI, bbox_inches='tight')
         print(f"图片已保存到: {output_file}")
     
-    # 清理临时文件（仅当未指定genbank_file时）
-    if is_temp_file and os.path.exists(gb_file):
-        os.unlink(gb_file)
-        print("临时GenBank文件已清理")
-    elif not is_temp_file:
-        print(f"GenBank文件已保存到: {gb_file}")
-    
     return fig
 
 
@@ -201,7 +242,7 @@ def plot_multi_tissue_comparison(genome_fasta, gff3_file, fp_files_dict, chrom,
     - figsize: 图片大小 (如果为None则自动调整)
     - highlight_regions: 高亮区域列表
     - output_file: 输出文件路径
-    - genbank_file: GenBank文件保存路径 (如果指定则不会删除该文件)
+    - genbank_file: GenBank文件保存路径 (为None时不写入磁盘)
     - colorbar_vmin: 颜色条最小值（默认None，表示自动取0）
     - colorbar_vmax: 颜色条最大值（默认None，表示自动取全局上限）
     
@@ -215,84 +256,37 @@ def plot_multi_tissue_comparison(genome_fasta, gff3_file, fp_files_dict, chrom,
         colorbar_vmax = float(colorbar_vmin) + 1e-6
 
     # 初始化组件
-    gb_creator = GenBankCreator()
     data_processor = FootprintDataProcessor()
     visualizer = FootprintVisualizer()
     
     n_tissues = len(fp_files_dict)
     
-    # 创建GenBank文件
-    print(f"正在为区域 {chrom}:{start}-{end} 创建GenBank文件...")
-    gb_file = gb_creator.create_from_region(genome_fasta, gff3_file, chrom, start, end, genbank_file)
-    is_temp_file = genbank_file is None
-    record = SeqIO.read(gb_file, "genbank")
+    # 创建GenBank记录（仅在指定genbank_file时写入磁盘）
+    print(f"正在为区域 {chrom}:{start}-{end} 创建GenBank记录...")
+    record, layout = _create_region_record(genome_fasta, gff3_file, chrom, start, end, genbank_file)
     region_len = end - start + 1
     
     # 智能绘制基因注释图（与单组织保持一致风格）
-    transcript_rows = []
-    base_idx = 1  # 热图起始轴索引（默认基因注释占1行）
+    transcript_rows = layout[0] if layout is not None else []
     
-    if record.features:
-        transcript_rows, transcript_ranges, transcripts = visualizer.create_transcript_layout_visualization(record)
-        if len(transcript_rows) > 1:
-            # 多行转录本布局：总行数 = 转录本行 + n个组织热图
-            total_rows = len(transcript_rows) + n_tissues
-            height_ratios = [1.2] * len(transcript_rows) + [2] * n_tissues
-            if figsize is None:
-                figsize = visualizer._auto_figsize(total_rows)
-            fig, axes = plt.subplots(
-                total_rows, 1, figsize=figsize,
-                gridspec_kw={"height_ratios": height_ratios}
-            )
-            if total_rows == 1:
-                axes = [axes]
-            # 绘制每一行的转录本，隐藏x轴标签
-            for row_idx, transcript_row in enumerate(transcript_rows):
-                visualizer.draw_transcript_row(axes[row_idx], transcript_row, transcript_ranges, transcripts, record, start, region_len=region_len)
-                axes[row_idx].tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-            base_idx = len(transcript_rows)
-        else:
-            # 单行转录本：1个基因注释轨道 + n个组织热图
-            total_rows = 1 + n_tissues
-            height_ratios = [3] + [2] * n_tissues
-            if figsize is None:
-                figsize = visualizer._auto_figsize(total_rows)
-            fig, axes = plt.subplots(
-                total_rows, 1, figsize=figsize,
-                gridspec_kw={"height_ratios": height_ratios}
-            )
-            if total_rows == 1:
-                axes = [axes]
-            translator = TypeOnlyTranslator()
-            graphic_record = translator.translate_record(record)
-            # 不设置first_index，使用相对坐标（从0开始）
-            graphic_record.plot(ax=axes[0], with_ruler=False, draw_line=False, strand_in_label_threshold=4)
-            visualizer._add_intron_connections_simple(axes[0], record, 0)
-            # 设置x轴范围为相对坐标
-            axes[0].set_xlim(0, len(record.seq))
-            axes[0].tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-            base_idx = 1
+    if len(transcript_rows) > 1:
+        # 多行转录本布局：总行数 = 转录本行 + n个组织热图
+        height_ratios = [1.2] * len(transcript_rows) + [2] * n_tissues
     else:
-        # 无特征：退回简单单行基因注释
-        total_rows = 1 + n_tissues
+        # 单行转录本或无特征：1个基因注释轨道 + n个组织热图
         height_ratios = [3] + [2] * n_tissues
-        if figsize is None:
-            figsize = visualizer._auto_figsize(total_rows)
-        fig, axes = plt.subplots(
-            total_rows, 1, figsize=figsize,
-            gridspec_kw={"height_ratios": height_ratios}
-        )
-        if total_rows == 1:
-            axes = [axes]
-        translator = TypeOnlyTranslator()
-        graphic_record = translator.translate_record(record)
-        # 不设置first_index，使用相对坐标（从0开始）
-        graphic_record.plot(ax=axes[0], with_ruler=False, draw_line=False, strand_in_label_threshold=4)
-        visualizer._add_intron_connections_simple(axes[0], record, 0)
-        # 设置x轴范围为相对坐标
-        axes[0].set_xlim(0, len(record.seq))
-        axes[0].tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-        base_idx = 1
+    total_rows = len(height_ratios)
+    base_idx = total_rows - n_tissues  # 热图起始轴索引
+    
+    if figsize is None:
+        figsize = visualizer._auto_figsize(total_rows)
+    fig, axes = plt.subplots(
+        total_rows, 1, figsize=figsize,
+        gridspec_kw={"height_ratios": height_ratios}
+    )
+    if total_rows == 1:
+        axes = [axes]
+    _draw_annotation_tracks(visualizer, axes[:base_idx], record, layout, start, region_len)
     
     # 为每个组织绘制footprint热图
     tissue_names = list(fp_files_dict.keys())
@@ -300,33 +294,43 @@ def plot_multi_tissue_comparison(genome_fasta, gff3_file, fp_files_dict, chrom,
     tissue_data = []     # 存储所有组织的数据
     
     # 第一遍：加载所有数据并计算全局最大值
-    for i, (tissue, fp_file) in enumerate(fp_files_dict.items()):
+    # parquet的读取和解码在pyarrow的C++层进行并释放GIL，因此各组织的数据可用线程并行加载
+    with ThreadPoolExecutor(max_workers=max(1, min(n_tissues, os.cpu_count() or 1))) as executor:
+        futures = {
+            tissue: executor.submit(data_processor.load_footprint_scores, fp_file, chrom, start, end)
+            for tissue, fp_file in fp_files_dict.items()
+        }
+    
+    for tissue, future in futures.items():
         print(f"正在处理 {tissue} 组织的footprint数据...")
         
-        # 加载footprint数据
-        fp_data = data_processor.load_footprint_scores(fp_file, chrom, start, end)
+        # 获取footprint数据
+        fp_data = future.result()
         
         if fp_data.empty:
             print(f"警告: {tissue} 组织在区域 {chrom}:{start}-{end} 中未找到footprint数据")
-            heatmap_data = np.zeros((99, region_len))
+            heatmap_data = np.zeros((99, region_len), dtype=np.float32)
             radii = np.arange(2, 101)
             max_score = 0
         else:
             print(f"{tissue}: 找到 {len(fp_data)} 个footprint数据点")
             heatmap_data, positions, radii = data_processor.create_heatmap_data(fp_data, start, end)
-            raw_max = np.max(heatmap_data) if np.max(heatmap_data) > 0 else 0
+            raw_max = float(np.nanmax(heatmap_data))  # 只做一次全矩阵归约（忽略长格式数据中的NaN）
+            if not raw_max > 0:  # 非正数或NaN时视为0
+                raw_max = 0.0
             max_score = min(raw_max, 5.0)  # 限制每个组织的最大值不超过5
             print(f"{tissue} 数据最大值: {raw_max:.3f}")
         
         tissue_data.append((tissue, heatmap_data, radii, max_score))
         all_max_scores.append(max_score)
     
-    # 计算全局最大值，限制不超过5
-    raw_global_max = max(all_max_scores) if all_max_scores and max(all_max_scores) > 0 else 1.0
-    global_max = min(raw_global_max, 5.0)
+    # 计算全局最大值（各组织的最大值已限制不超过5）
+    global_max = max(all_max_scores, default=0.0)
+    if global_max <= 0:
+        global_max = 1.0
     effective_vmin = 0.0 if colorbar_vmin is None else float(colorbar_vmin)
     effective_vmax = global_max if colorbar_vmax is None else float(colorbar_vmax)
-    print(f"所有组织最大值: {raw_global_max:.3f}, colorbar范围: [{effective_vmin:.3f}, {effective_vmax:.3f}]")
+    print(f"所有组织最大值: {global_max:.3f}, colorbar范围: [{effective_vmin:.3f}, {effective_vmax:.3f}]")
     
     # 第二遍：绘制热图
     im = None
@@ -336,19 +340,16 @@ def plot_multi_tissue_comparison(genome_fasta, gff3_file, fp_files_dict, chrom,
         ax = axes[i + base_idx]
         im = visualizer.plot_heatmap(
             ax, heatmap_data, radii, region_len, global_max, heatmap_start, title=f"{tissue}",
-            vmin=colorbar_vmin, vmax=colorbar_vmax
+            vmin=colorbar_vmin, vmax=colorbar_vmax, dpi=_OUTPUT_DPI
         )
         
         # 与单组织风格一致：y轴仅显示数值含义，将组织名放在左侧标题位置
         ax.set_ylabel("FootPrint Size (bp)")
         ax.set_title(tissue, loc='left', fontsize=10)
-        
-        # 隐藏除了最后一个子图外的x轴刻度和标签
-        if i < n_tissues - 1:
-            ax.tick_params(axis='x', which='both', bottom=False, top=False, labelbottom=False)
-        else:
-            # 只在最后一个子图显示x轴标签
-            ax.set_xlabel(f"{chrom} position (bp)")
+    
+    # 只在最后一个子图显示x轴刻度和标签
+    _hide_inner_xaxes(axes)
+    axes[-1].set_xlabel(f"{chrom} position (bp)")
     
     # 添加高亮区域
     # 对于单行布局，需要调整高亮区域的坐标为相对坐标
@@ -376,16 +377,9 @@ def plot_multi_tissue_comparison(genome_fasta, gff3_file, fp_files_dict, chrom,
     
     # 保存图片（避免在PDF后端中因bbox_inches='tight'导致的超大栅格区域问题）
     if output_file:
-        plt.savefig(output_file, dpi=300)
+        plt.savefig(output_file, dpi=_OUTPUT_DPI)
         print(f"比较图已保存到: {output_file}")
     
-    # 清理临时文件（仅当未指定genbank_file时）
-    if is_temp_file and os.path.exists(gb_file):
-        os.unlink(gb_file)
-        print("临时GenBank文件已清理")
-    elif not is_temp_file:
-        print(f"GenBank文件已保存到: {gb_file}")
-    
     return fig
 
 
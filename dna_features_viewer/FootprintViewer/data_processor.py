@@ -4,9 +4,54 @@ FootPrint数据处理模块
 处理footprint分数数据，包括数据加载和热图矩阵转换
 """
 
+import functools
+import re
+
 import pandas as pd
 import numpy as np
 
+try:
+    import pyarrow.dataset as ds
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+# 宽格式数据中的半径列名（r2, r3, ..., r100）
+_RADIUS_COLUMN = re.compile(r'^r\d+$')
+
+
+@functools.lru_cache(maxsize=None)
+def _get_scatter_long():
+    """
+    首次处理长格式数据时才导入numba并编译写入函数，避免所有使用者在导入模块时承担numba的开销
+    
+    返回:
+    - 编译后的 _scatter_long(pos, radius, score, out, start, radius_min)；numba不可用时返回None
+    """
+    try:
+        import numba
+    except ImportError:
+        return None
+
+    @numba.njit(cache=True)
+    def _scatter_long(pos, radius, score, out, start, radius_min):
+        """将长格式数据 (pos, radius, score) 逐条写入热图矩阵（编译为本地代码）"""
+        for i in range(pos.shape[0]):
+            pos_idx = pos[i] - start
+            radius_idx = radius[i] - radius_min
+            if 0 <= pos_idx < out.shape[1] and 0 <= radius_idx < out.shape[0]:
+                out[radius_idx, pos_idx] = score[i]
+
+    return _scatter_long
+
+
+def _contiguous_slice(indices):
+    """若索引数组按升序连续（如 5, 6, 7, ...），返回等价的切片，否则返回None"""
+    if indices[-1] - indices[0] == len(indices) - 1 and np.all(np.diff(indices) == 1):
+        return slice(indices[0], indices[-1] + 1)
+    return None
+
 
 class FootprintDataProcessor:
     """FootPrint数据处理器"""
@@ -19,6 +64,18 @@ class FootprintDataProcessor:
         - default_radius_range: 默认的footprint半径范围 (min, max)
         """
         self.default_radius_range = default_radius_range
+        
+        # 预先生成默认半径范围对应的宽格式列名（r2, r3, ..., r100）
+        self._radius_col_range = tuple(default_radius_range)
+        self._radius_col_names = [
+            f'r{radius}' for radius in range(default_radius_range[0], default_radius_range[1] + 1)
+        ]
+    
+    def _radius_column_names(self, radius_range):
+        """返回半径范围对应的宽格式列名列表"""
+        if tuple(radius_range) == self._radius_col_range:
+            return self._radius_col_names
+        return [f'r{radius}' for radius in range(radius_range[0], radius_range[1] + 1)]
     
     def load_footprint_scores(self, fp_score_file, chrom, start, end):
         """
@@ -32,37 +89,38 @@ class FootprintDataProcessor:
         
         返回:
         - DataFrame: 包含该区域的footprint分数数据
+
+        注意:
+        - 为使区域过滤能够跳过无关的row group，parquet文件应按 (chrom, pos)
+          排序写入，并使用适中的row group大小（约64k行）
         """
         
-        # 读取parquet文件
-        try:
-            df = pd.read_parquet(fp_score_file, engine="fastparquet")
-        except ImportError:
-            # 如果fastparquet不可用，尝试使用pyarrow
-            try:
-                df = pd.read_parquet(fp_score_file, engine="pyarrow")
-            except ImportError:
-                # 如果两个都不可用，使用默认引擎
-                df = pd.read_parquet(fp_score_file)
-        
-        # 检查数据格式
-        # 新格式：chrom和pos为列，r2到r100为footprint分数列
-        if 'chrom' in df.columns and 'pos' in df.columns and 'r2' in df.columns:
-            # 新格式：宽格式数据
-            # 筛选指定区域的数据
-            region_data = df[
-                (df['chrom'] == chrom) & 
-                (df['pos'] >= start) & 
-                (df['pos'] <= end)
-            ].copy()
-        else:
-            # 旧格式：长格式数据（chrom, pos, radius, score）
-            # 筛选指定区域的数据
-            region_data = df[
-                (df['chrom'] == chrom) & 
-                (df['pos'] >= start) & 
-                (df['pos'] <= end)
-            ].copy()
+        if PYARROW_AVAILABLE:
+            # 通过pyarrow dataset读取：区域过滤下推到parquet读取层，
+            # 利用row group的min/max统计信息跳过不相关的数据块，并只解码需要的列
+            dataset = ds.dataset(fp_score_file, format="parquet")
+            columns = [
+                name for name in dataset.schema.names
+                if name in ('chrom', 'pos', 'radius', 'score') or _RADIUS_COLUMN.match(name)
+            ]
+            table = dataset.to_table(
+                columns=columns,
+                filter=(ds.field('chrom') == chrom) &
+                       (ds.field('pos') >= start) &
+                       (ds.field('pos') <= end)
+            )
+            return table.to_pandas(self_destruct=True)
+
+        # pyarrow不可用时退回fastparquet，读取整个文件后再筛选
+        df = pd.read_parquet(fp_score_file, engine="fastparquet")
+
+        # 宽格式（chrom, pos, r2..r100）与长格式（chrom, pos, radius, score）
+        # 均按chrom和pos筛选指定区域的数据
+        region_data = df[
+            (df['chrom'] == chrom) & 
+            (df['pos'] >= start) & 
+            (df['pos'] <= end)
+        ].copy()
         
         return region_data
     
@@ -89,34 +147,52 @@ class FootprintDataProcessor:
         positions = np.arange(start, end + 1)
         radii = np.arange(radius_range[0], radius_range[1] + 1)
         
-        # 初始化热图数据矩阵
-        heatmap_data = np.zeros((len(radii), region_length))
+        # 初始化热图数据矩阵（float32足以表示分数，并减半内存占用）
+        heatmap_data = np.zeros((len(radii), region_length), dtype=np.float32)
         
         # 检查数据格式并填充数据
         if 'r2' in fp_data.columns:
             # 新格式：宽格式数据，每个半径是一个列（r2, r3, ..., r100）
-            for _, row in fp_data.iterrows():
-                pos_idx = int(row['pos']) - start  # 转换为相对位置索引
-                
-                if 0 <= pos_idx < region_length:
-                    # 遍历所有半径列
-                    for radius in radii:
-                        col_name = f'r{radius}'
-                        if col_name in fp_data.columns:
-                            radius_idx = radius - radius_range[0]  # 转换为半径索引
-                            if 0 <= radius_idx < len(radii):
-                                score = row[col_name]
-                                # 处理可能的NaN值
-                                if pd.notna(score):
-                                    heatmap_data[radius_idx, pos_idx] = score
+            # 将半径列整体取为二维数组，按位置索引一次性写入热图矩阵
+            col_idx = fp_data.columns.get_indexer(self._radius_column_names(radius_range))
+            radius_idx = np.flatnonzero(col_idx >= 0)  # 数据中存在的半径列
+            pos_idx = fp_data['pos'].to_numpy(dtype=np.int64) - start  # 转换为相对位置索引
+            pos_mask = (pos_idx >= 0) & (pos_idx < region_length)
+
+            if len(radius_idx) > 0 and pos_mask.any():
+                values = fp_data.iloc[:, col_idx[radius_idx]].to_numpy(
+                    dtype=heatmap_data.dtype, copy=True
+                )
+                # 处理可能的NaN值（视为0，与热图初始值一致）
+                values[np.isnan(values)] = 0.0
+                pos_idx = pos_idx[pos_mask]
+                block = values[pos_mask].T
+                rows = _contiguous_slice(radius_idx)
+                cols = _contiguous_slice(pos_idx)
+                if rows is not None and cols is not None:
+                    # 半径与位置均连续（区域筛选后的常见情况）：按切片整块复制
+                    heatmap_data[rows, cols] = block
+                else:
+                    heatmap_data[radius_idx[:, None], pos_idx] = block
         else:
             # 旧格式：长格式数据（chrom, pos, radius, score）
-            for _, row in fp_data.iterrows():
-                pos_idx = int(row['pos']) - start  # 转换为相对位置索引
-                radius_idx = int(row['radius']) - radius_range[0]  # 转换为半径索引
-                
-                if 0 <= pos_idx < region_length and 0 <= radius_idx < len(radii):
-                    heatmap_data[radius_idx, pos_idx] = row['score']
+            pos = fp_data['pos'].to_numpy(dtype=np.int64)
+            radius = fp_data['radius'].to_numpy(dtype=np.int64)
+            score = fp_data['score'].to_numpy(dtype=heatmap_data.dtype)
+            
+            scatter_long = _get_scatter_long()
+            if scatter_long is not None:
+                # 使用numba编译的循环逐条写入
+                scatter_long(pos, radius, score, heatmap_data, start, radius_range[0])
+            else:
+                # 无numba时使用NumPy向量化写入
+                pos_idx = pos - start  # 转换为相对位置索引
+                radius_idx = radius - radius_range[0]  # 转换为半径索引
+                mask = (
+                    (pos_idx >= 0) & (pos_idx < region_length) &
+                    (radius_idx >= 0) & (radius_idx < len(radii))
+                )
+                heatmap_data[radius_idx[mask], pos_idx[mask]] = score[mask]
         
         return heatmap_data, positions, radii
     
@@ -4,13 +4,105 @@ GenBank文件创建模块
 从基因组FASTA和GFF3文件中提取指定区域并创建GenBank文件
 """
 
+import csv
+import functools
+import re
 import tempfile
 import os
+
+import numpy as np
+import pandas as pd
 from Bio import SeqIO
 from Bio.Seq import Seq
 from Bio.SeqRecord import SeqRecord
 from Bio.SeqFeature import SeqFeature, FeatureLocation
 
+try:
+    import pyfaidx
+
+    PYFAIDX_AVAILABLE = True
+except ImportError:
+    PYFAIDX_AVAILABLE = False
+
+
+# GFF3中需要读取的列（其余列不解析）
+_GFF3_COLUMNS = {0: 'seqname', 2: 'type', 3: 'start', 4: 'end', 6: 'strand', 8: 'attributes'}
+
+# GFF3属性中的 key=value 对（以';'分隔，value中可包含'='）
+_GFF3_ATTRIBUTE = re.compile(r'([^=;\s]+)=([^;]*)')
+
+
+@functools.lru_cache(maxsize=4)
+def _load_gff3(gff3_file, mtime):
+    """
+    使用pandas的C解析器读取GFF3文件，按染色体分区并缓存，避免每次调用都重新扫描文件
+    
+    参数:
+    - gff3_file: GFF3注释文件的绝对路径
+    - mtime: 文件修改时间（仅作为缓存键，文件更新后自动重新读取）
+    
+    返回:
+    - dict: {染色体名称: 分区}，每个分区为包含以下键的字典：
+        - 'features': 该染色体的特征DataFrame（列为 type, start, end, strand, attributes），
+          按start排序，索引为文件中的行序
+        - 'starts': 排序后的start数组
+        - 'max_ends': end的前缀最大值数组，用于二分查找与区域重叠的第一个特征
+        - 'type_counts': 各特征类型的数量
+    """
+    try:
+        # 不使用comment参数（它会截断属性值中'#'之后的内容），也不把'NA'、'null'等
+        # 字符串当作缺失值；注释行在读取后按行首'#'过滤
+        df = pd.read_csv(
+            gff3_file, sep='\t', header=None, names=range(9),
+            usecols=list(_GFF3_COLUMNS), dtype=str, keep_default_na=False,
+            quoting=csv.QUOTE_NONE, on_bad_lines='skip', engine='c'
+        )
+    except pd.errors.EmptyDataError:
+        return {}
+    df = df.rename(columns=_GFF3_COLUMNS)
+    df = df[~df['seqname'].str.startswith('#', na=False)]
+    # 缺少属性列的截断行在keep_default_na=False下读作空字符串，与原逐行解析一样跳过
+    df = df[df['attributes'] != '']
+    
+    # 转换坐标为整数（GFF3是1-based），跳过不完整或坐标无效的行
+    df['start'] = pd.to_numeric(df['start'], errors='coerce')
+    df['end'] = pd.to_numeric(df['end'], errors='coerce')
+    df = df.dropna()
+    df = df.astype({
+        'type': 'category', 'strand': 'category',
+        'start': np.int64, 'end': np.int64
+    })
+    df = df.reset_index(drop=True)
+    
+    partitions = {}
+    for seqname, chrom_df in df.groupby('seqname', sort=False):
+        chrom_df = chrom_df.drop(columns='seqname').sort_values('start', kind='stable')
+        partitions[seqname] = {
+            'features': chrom_df,
+            'starts': chrom_df['start'].to_numpy(),
+            'max_ends': np.maximum.accumulate(chrom_df['end'].to_numpy()),
+            'type_counts': chrom_df['type'].value_counts().to_dict(),
+        }
+    return partitions
+
+
+@functools.lru_cache(maxsize=8)
+def _open_genome_fasta(genome_fasta, mtime):
+    """
+    打开基因组FASTA文件的索引并缓存，多次调用共享同一个文件句柄
+    
+    参数:
+    - genome_fasta: 基因组FASTA文件的绝对路径
+    - mtime: 文件修改时间（仅作为缓存键，文件更新后自动重新打开）
+    
+    返回:
+    - 以染色体名称为键的索引：pyfaidx可用时为pyfaidx.Fasta（借助.fai索引只读取
+      所需区间），否则为Bio.SeqIO.index
+    """
+    if PYFAIDX_AVAILABLE:
+        return pyfaidx.Fasta(genome_fasta, as_raw=True, sequence_always_upper=False)
+    return SeqIO.index(genome_fasta, "fasta")
+
 
 class GenBankCreator:
     """GenBank文件创建器"""
@@ -44,6 +136,25 @@ class GenBankCreator:
         返回:
         - GenBank文件路径
         """
+        record = self.create_record_from_region(genome_fasta, gff3_file, chrom, start, end)
+        
+        # 保存为GenBank格式
+        if output_path is None:
+            temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.gb', delete=False)
+            output_path = temp_file.name
+            temp_file.close()
+        
+        SeqIO.write(record, output_path, "genbank")
+        return output_path
+    
+    def create_record_from_region(self, genome_fasta, gff3_file, chrom, start, end):
+        """
+        从基因组FASTA和GFF3文件中提取指定区域并创建内存中的GenBank记录，
+        不写入磁盘（参数与create_from_region相同）
+        
+        返回:
+        - SeqRecord: 包含区域序列和特征的记录
+        """
         
         # 准备区域序列
         region_len = end - start + 1
@@ -51,12 +162,17 @@ class GenBankCreator:
             # 无FASTA：以等长'N'序列代替
             region_seq = Seq('N' * region_len)
         else:
-            # 读取基因组序列
-            genome_dict = SeqIO.to_dict(SeqIO.parse(genome_fasta, "fasta"))
-            if chrom not in genome_dict:
+            # 基因组索引在多次调用间缓存，只读取目标区域，而不是解析整个基因组
+            genome_index = _open_genome_fasta(
+                os.path.abspath(genome_fasta), os.path.getmtime(genome_fasta)
+            )
+            if chrom not in genome_index:
                 raise ValueError(f"染色体 {chrom} 在基因组文件中未找到")
             # 提取目标区域序列 (转换为0-based索引)
-            region_seq = genome_dict[chrom].seq[start-1:end]
+            if PYFAIDX_AVAILABLE:
+                region_seq = Seq(genome_index[chrom][start-1:end])
+            else:
+                region_seq = genome_index[chrom].seq[start-1:end]
         
         # 创建SeqRecord
         record = SeqRecord(
@@ -77,14 +193,7 @@ class GenBankCreator:
         features = self._parse_gff3_features(gff3_file, chrom, start, end)
         record.features = features
         
-        # 保存为GenBank格式
-        if output_path is None:
-            temp_file = tempfile.NamedTemporaryFile(mode='w', suffix='.gb', delete=False)
-            output_path = temp_file.name
-            temp_file.close()
-        
-        SeqIO.write(record, output_path, "genbank")
-        return output_path
+        return record
     
     def _parse_gff3_features(self, gff3_file, chrom, start, end):
         """解析GFF3文件中的特征"""
@@ -93,97 +202,56 @@ class GenBankCreator:
         
         print(f"正在解析GFF3文件中 {chrom}:{start}-{end} 区域的特征...")
         
-        # 第一遍：收集转录本信息
-        with open(gff3_file, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                if line.startswith('#') or line.strip() == '':
-                    continue
-                    
-                parts = line.strip().split('\t')
-                if len(parts) < 9:
-                    continue
-                    
-                seqname, source, feature_type, start_pos, end_pos, score, strand, phase, attributes = parts
-                
-                # 只处理目标染色体的mRNA/transcript
-                if seqname != chrom or feature_type not in ['mRNA', 'transcript']:
-                    continue
-                
-                # 转换坐标为整数
-                try:
-                    feat_start = int(start_pos)  # GFF3是1-based
-                    feat_end = int(end_pos)
-                except ValueError:
-                    continue
-                
-                # 检查是否与目标区域重叠
-                if feat_start > end or feat_end < start:
-                    continue
-                    
-                # 解析attributes
-                attr_dict = self._parse_gff_attributes(attributes)
-                
-                # 收集转录本信息
-                transcript_id = attr_dict.get('ID', '')
-                transcript_name = attr_dict.get('Name', attr_dict.get('ID', ''))
-                if transcript_id and transcript_name:
-                    transcript_map[transcript_id] = transcript_name
+        # GFF3文件只读取一次并按染色体分区缓存（以路径和修改时间为键）
+        gff3_partitions = _load_gff3(os.path.abspath(gff3_file), os.path.getmtime(gff3_file))
+        
+        # 只处理目标染色体
+        partition = gff3_partitions.get(chrom)
+        if partition is None:
+            region_df = pd.DataFrame(columns=['type', 'start', 'end', 'strand', 'attributes'])
+            type_counts = {}
+        else:
+            # 二分查找与目标区域重叠的特征：start <= end 且 end >= start
+            lo = np.searchsorted(partition['max_ends'], start, side='left')
+            hi = np.searchsorted(partition['starts'], end, side='right')
+            region_df = partition['features'].iloc[lo:hi]
+            region_df = region_df[region_df['end'] >= start].sort_index()  # 恢复文件中的顺序
+            type_counts = partition['type_counts']
+        
+        feature_count = sum(type_counts.values())
+        target_feature_count = sum(type_counts.get(t, 0) for t in self.target_feature_types)
+        
+        is_target = region_df['type'].isin(list(self.target_feature_types))
+        is_transcript = region_df['type'].isin(['mRNA', 'transcript'])
+        
+        # 收集转录本信息（只解析区域内转录本的attributes）
+        for attributes in region_df.loc[is_transcript, 'attributes']:
+            attr_dict = self._parse_gff_attributes(attributes)
+            transcript_id = attr_dict.get('ID', '')
+            transcript_name = attr_dict.get('Name', attr_dict.get('ID', ''))
+            if transcript_id and transcript_name:
+                transcript_map[transcript_id] = transcript_name
         
         print(f"收集到 {len(transcript_map)} 个转录本映射")
         
-        # 第二遍：处理目标特征类型
-        feature_count = 0
-        target_feature_count = 0
-        
-        with open(gff3_file, 'r') as f:
-            for line_num, line in enumerate(f, 1):
-                if line.startswith('#') or line.strip() == '':
-                    continue
-                    
-                parts = line.strip().split('\t')
-                if len(parts) < 9:
-                    continue
-                    
-                seqname, source, feature_type, start_pos, end_pos, score, strand, phase, attributes = parts
-                
-                # 只处理目标染色体
-                if seqname != chrom:
-                    continue
-                    
-                feature_count += 1
-                
-                # 只处理目标特征类型
-                if feature_type not in self.target_feature_types:
-                    continue
-                    
-                target_feature_count += 1
-                
-                # 转换坐标为整数
-                try:
-                    feat_start = int(start_pos)  # GFF3是1-based
-                    feat_end = int(end_pos)
-                except ValueError:
-                    continue
-                
-                # 检查是否与目标区域重叠
-                if feat_start > end or feat_end < start:
-                    continue
-                    
-                # 解析attributes
-                attr_dict = self._parse_gff_attributes(attributes)
-                
-                # 计算在目标区域内的相对坐标，处理截断情况
-                relative_start = max(0, feat_start - start)
-                relative_end = min(end - start + 1, feat_end - start + 1)
-                
-                # 确保有效的坐标范围
-                if relative_end > relative_start:
-                    # 创建SeqFeature
-                    feature_obj = self._create_seq_feature(
-                        feature_type, relative_start, relative_end, strand,
-                        attr_dict, transcript_map
-                    )
-                    features.append(feature_obj)
+        # 转录本映射收集完成后再创建区域内的目标特征
+        target_df = region_df.loc[is_target, ['type', 'start', 'end', 'strand', 'attributes']]
+        for feature_type, feat_start, feat_end, strand, attributes in target_df.itertuples(index=False):
+            # 解析attributes
+            attr_dict = self._parse_gff_attributes(attributes)
+            
+            # 计算在目标区域内的相对坐标，处理截断情况
+            relative_start = max(0, int(feat_start) - start)
+            relative_end = min(end - start + 1, int(feat_end) - start + 1)
+            
+            # 确保有效的坐标范围
+            if relative_end > relative_start:
+                # 创建SeqFeature
+                feature_obj = self._create_seq_feature(
+                    feature_type, relative_start, relative_end, strand,
+                    attr_dict, transcript_map
+                )
+                features.append(feature_obj)
         
         print(f"处理了 {feature_count} 个特征，找到 {target_feature_count} 个目标类型特征")
         print(f"最终添加到GenBank的特征数: {len(features)}")
@@ -192,12 +260,7 @@ class GenBankCreator:
     
     def _parse_gff_attributes(self, attributes):
         """解析GFF3属性字符串"""
-        attr_dict = {}
-        for attr in attributes.split(';'):
-            if '=' in attr:
-                key, value = attr.split('=', 1)
-                attr_dict[key] = value
-        return attr_dict
+        return dict(_GFF3_ATTRIBUTE.findall(attributes))
     
     def _create_seq_feature(self, feature_type, relative_start, relative_end, 
                            strand, attr_dict, transcript_map):
@@ -207,15 +270,16 @@ class GenBankCreator:
         parent_attr = attr_dict.get('Parent', '')
         
         if parent_attr:
-            # Parent可能包含多个ID，用逗号分隔
-            parent_ids = parent_attr.split(',')
-            for parent_id in parent_ids:
-                if parent_id in transcript_map:
-                    transcript_name = transcript_map[parent_id]
-                    break
-            else:
-                # 如果在映射中没找到，使用第一个Parent ID
-                transcript_name = parent_ids[0].split('.')[0] if '.' in parent_ids[0] else parent_ids[0]
+            # 常见情况：Parent只有一个ID，一次字典查找即可
+            transcript_name = transcript_map.get(parent_attr)
+            if transcript_name is None:
+                # Parent可能包含多个ID，用逗号分隔
+                parent_ids = parent_attr.split(',')
+                transcript_name = next(
+                    (transcript_map[p] for p in parent_ids if p in transcript_map),
+                    # 如果在映射中没找到，使用第一个Parent ID（去掉'.'后缀）
+                    parent_ids[0].partition('.')[0]
+                )
         
         # 创建标签：转录本-特征类型
         feature_type_label = self.target_feature_types[feature_type]
@@ -4,11 +4,77 @@ FootPrint可视化模块
 包含用于绘制基因注释和footprint热图的可视化工具
 """
 
+import heapq
+import logging
+import operator
+from collections import defaultdict, namedtuple
+
 import numpy as np
 import matplotlib.pyplot as plt
+from matplotlib.collections import LineCollection, PatchCollection, PolyCollection
+from matplotlib.patches import Rectangle
 from Bio import SeqIO
 from dna_features_viewer import BiopythonTranslator, GraphicFeature, GraphicRecord
 
+logger = logging.getLogger(__name__)
+
+# 转录本的一个组件（如5UTR、CDS、3UTR）：原始特征、组件类型、相对坐标、链方向和label
+TranscriptComponent = namedtuple(
+    'TranscriptComponent', ['feature', 'component_type', 'start', 'end', 'strand', 'label']
+)
+
+# 一行中的组件数超过该值时，不再逐个创建GraphicFeature，而是用一个PatchCollection绘制
+_DENSE_ROW_COMPONENTS = 500
+
+
+# 特征类型（小写）到显示标签的映射
+_TYPE_LABELS = {
+    "five_prime_utr": "5UTR",
+    "five_prime_untranslated_region": "5UTR",
+    "5utr": "5UTR",
+    "three_prime_utr": "3UTR",
+    "three_prime_untranslated_region": "3UTR",
+    "3utr": "3UTR",
+    "cds": "CDS",
+    "exon": "exon",
+    "mrna": "mRNA",
+    "gene": "gene"
+}
+
+# 特征类型（小写）到颜色的映射
+_TYPE_COLORS = {
+    "gene": "#ff9999",           # 浅红色
+    "mrna": "#99ff99",           # 浅绿色
+    "cds": "#9999ff",            # 浅蓝色
+    "exon": "#ffff99",           # 浅黄色
+    "five_prime_utr": "#ff99ff", # 浅紫色
+    "5utr": "#ff99ff",
+    "three_prime_utr": "#99ffff", # 浅青色
+    "3utr": "#99ffff",
+    "utr": "#f0f0f0"             # 浅灰色
+}
+
+
+def _pool_heatmap_columns(heatmap_data, max_cols):
+    """
+    当热图列数超过max_cols时，将相邻列分箱取最大值，减少传给imshow的数据量
+    （取最大值而不是平均值，使窄的footprint信号在缩小后仍然可见）
+    
+    参数:
+    - heatmap_data: 热图数据矩阵 (radius数量 x 位置数量)
+    - max_cols: 分箱后的最大列数
+    
+    返回:
+    - 分箱后的热图数据矩阵（列数不超过max_cols时原样返回）
+    """
+    n_cols = heatmap_data.shape[1]
+    if n_cols <= max_cols:
+        return heatmap_data
+    
+    factor = -(-n_cols // max_cols)  # 每个分箱的列数（向上取整，最后一个分箱可能不足factor列）
+    # fmax忽略NaN：分箱中只要有一个有效值就取有效值，全为NaN时才得到NaN
+    return np.fmax.reduceat(heatmap_data, np.arange(0, n_cols, factor), axis=1)
+
 
 class TypeOnlyTranslator(BiopythonTranslator):
     """自定义的转录本标签翻译器"""
@@ -17,39 +83,26 @@ class TypeOnlyTranslator(BiopythonTranslator):
         """
         计算特征标签，使用现有的label如果存在，否则生成默认标签
         """
+        qualifiers = feature.qualifiers
+        
         # 优先使用现有的label
-        if 'label' in feature.qualifiers and feature.qualifiers['label']:
-            return feature.qualifiers['label'][0]
+        label_list = qualifiers.get('label')
+        if label_list:
+            return label_list[0]
         
         t = (feature.type or "").lower()
-        
-        # 基本类型映射
-        type_map = {
-            "five_prime_utr": "5UTR",
-            "five_prime_untranslated_region": "5UTR",
-            "5utr": "5UTR",
-            "three_prime_utr": "3UTR", 
-            "three_prime_untranslated_region": "3UTR",
-            "3utr": "3UTR",
-            "cds": "CDS",
-            "exon": "exon",
-            "mrna": "mRNA",
-            "gene": "gene"
-        }
-        
-        base_label = type_map.get(t, feature.type or "feature")
+        base_label = _TYPE_LABELS.get(t, feature.type or "feature")
         
         # 尝试添加转录本信息
-        qualifiers = feature.qualifiers
         transcript_info = ""
         
         # 优先级：Name > ID > Parent
-        if 'Name' in qualifiers and qualifiers['Name']:
-            transcript_info = f":{qualifiers['Name'][0]}"
-        elif 'ID' in qualifiers and qualifiers['ID']:
-            transcript_info = f":{qualifiers['ID'][0]}"
-        elif 'Parent' in qualifiers and qualifiers['Parent']:
-            parent_id = qualifiers['Parent'][0]
+        name_list = qualifiers.get('Name') or qualifiers.get('ID')
+        parent_list = qualifiers.get('Parent')
+        if name_list:
+            transcript_info = f":{name_list[0]}"
+        elif parent_list:
+            parent_id = parent_list[0]
             # 简化Parent ID显示
             if '.' in parent_id:
                 parent_id = parent_id.split('.')[-1]
@@ -62,20 +115,7 @@ class TypeOnlyTranslator(BiopythonTranslator):
         为不同类型的特征设置不同颜色
         """
         t = (feature.type or "").lower()
-        
-        color_map = {
-            "gene": "#ff9999",           # 浅红色
-            "mrna": "#99ff99",           # 浅绿色
-            "cds": "#9999ff",            # 浅蓝色
-            "exon": "#ffff99",           # 浅黄色
-            "five_prime_utr": "#ff99ff", # 浅紫色
-            "5utr": "#ff99ff",
-            "three_prime_utr": "#99ffff", # 浅青色
-            "3utr": "#99ffff",
-            "utr": "#f0f0f0"             # 浅灰色
-        }
-        
-        return color_map.get(t, "#cccccc")  # 默认浅灰色
+        return _TYPE_COLORS.get(t, "#cccccc")  # 默认浅灰色
 
 
 class FootprintVisualizer:
@@ -124,102 +164,108 @@ class FootprintVisualizer:
     
     def create_transcript_layout_visualization(self, record):
         """
-        根据label中'-'前的转录本名称分组，
+        根据label中最后一个'-'前的转录本名称分组，
         将不重叠的转录本放在同一行，重叠的转录本放在不同行
         """
         
         # 1. 解析所有特征，按转录本/特征分组
-        transcripts = {}
+        transcripts = defaultdict(list)
         
         for feature in record.features:
-            if 'label' in feature.qualifiers:
-                label = feature.qualifiers['label'][0]
-                if '-' in label:
-                    transcript_name = label.split('-')[0]  # 取'-'前的部分作为转录本名称
-                    component_type = label.split('-')[1]   # 取'-'后的部分作为组件类型
-                    
-                    if transcript_name not in transcripts:
-                        transcripts[transcript_name] = []
-                    
-                    transcripts[transcript_name].append({
-                        'feature': feature,
-                        'component_type': component_type,
-                        'start': int(feature.location.start),
-                        'end': int(feature.location.end),
-                        'strand': feature.location.strand,
-                        'label': label
-                    })
-                else:
-                    # 将没有'-'的特征作为单独的"转录本"处理
-                    transcript_name = label  # 直接使用label作为名称
-                    transcripts[transcript_name] = [{
-                        'feature': feature,
-                        'component_type': feature.type,  # 使用特征类型作为组件类型
-                        'start': int(feature.location.start),
-                        'end': int(feature.location.end),
-                        'strand': feature.location.strand,
-                        'label': label
-                    }]
-        
-        print("识别到的转录本:")
-        for transcript_name, components in transcripts.items():
-            print(f"  {transcript_name}: {len(components)}个组件")
-            for comp in components:
-                print(f"    - {comp['component_type']}: {comp['start']}-{comp['end']}")
+            label_list = feature.qualifiers.get('label')
+            if not label_list:
+                continue
+            label = label_list[0]
+            location = feature.location
+            
+            # label由GenBankCreator按 "转录本名称-组件类型" 生成，转录本名称本身可能含'-'，
+            # 因此从右侧拆分为 转录本名称（最后一个'-'前）和 组件类型（最后一个'-'后）
+            transcript_name, sep, component_type = label.rpartition('-')
+            component = TranscriptComponent(
+                feature, component_type if sep else feature.type,
+                int(location.start), int(location.end), location.strand, label
+            )
+            if sep:
+                transcripts[transcript_name].append(component)
+            else:
+                # 将没有'-'的特征作为单独的"转录本"处理，直接使用label作为名称，
+                # 并使用特征类型作为组件类型
+                transcripts[label] = [component]
+        transcripts = dict(transcripts)  # 返回普通字典，避免调用方访问不存在的键时意外插入
+        
+        # 各转录本的组件按基因组位置排序一次，绘制内含子连接线时无需再排序
+        for components in transcripts.values():
+            components.sort(key=operator.attrgetter('start'))
+        
+        # 逐个组件的调试信息只在开启DEBUG日志时输出
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("识别到的转录本:")
+            for transcript_name, components in transcripts.items():
+                logger.debug("  %s: %d个组件", transcript_name, len(components))
+                for comp in components:
+                    logger.debug("    - %s: %d-%d", comp.component_type, comp.start, comp.end)
         
         # 2. 计算转录本的整体范围
+        # 组件已按转录本分组，将所有组件坐标拼成一维数组后按分组边界一次性求最小/最大值
         transcript_ranges = {}
-        for transcript_name, components in transcripts.items():
-            starts = [comp['start'] for comp in components]
-            ends = [comp['end'] for comp in components]
-            transcript_ranges[transcript_name] = {
-                'start': min(starts),
-                'end': max(ends),
-                'components': components
-            }
+        if transcripts:
+            counts = np.fromiter((len(c) for c in transcripts.values()), dtype=np.int64, count=len(transcripts))
+            boundaries = np.concatenate(([0], np.cumsum(counts)[:-1]))
+            all_components = [comp for components in transcripts.values() for comp in components]
+            starts = np.fromiter((comp.start for comp in all_components), dtype=np.int64, count=len(all_components))
+            ends = np.fromiter((comp.end for comp in all_components), dtype=np.int64, count=len(all_components))
+            tr_starts = np.minimum.reduceat(starts, boundaries)
+            tr_ends = np.maximum.reduceat(ends, boundaries)
+            for (transcript_name, components), tr_start, tr_end in zip(transcripts.items(), tr_starts, tr_ends):
+                transcript_ranges[transcript_name] = {
+                    'start': int(tr_start),
+                    'end': int(tr_end),
+                    'components': components
+                }
         
         # 3. 智能布局算法：将不重叠的转录本放在同一行
         transcript_rows = self._arrange_transcript_rows(transcript_ranges)
         
-        print(f"\n布局结果（共{len(transcript_rows)}行）:")
-        for i, row in enumerate(transcript_rows):
-            print(f"  第{i+1}行: {', '.join(row)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("布局结果（共%d行）:", len(transcript_rows))
+            for i, row in enumerate(transcript_rows):
+                logger.debug("  第%d行: %s", i + 1, ', '.join(row))
         
         return transcript_rows, transcript_ranges, transcripts
     
     def _arrange_transcript_rows(self, transcript_ranges):
-        """智能布局算法：将不重叠的转录本放在同一行"""
-        def transcripts_overlap(t1_range, t2_range):
-            """检查两个转录本是否重叠"""
-            return not (t1_range['end'] < t2_range['start'] or t2_range['end'] < t1_range['start'])
+        """
+        智能布局算法：将不重叠的转录本放在同一行
         
-        # 贪心算法分配行
-        transcript_rows = []
-        transcript_names = list(transcript_ranges.keys())
+        按起始位置扫描转录本，用最小堆维护各行当前的结束位置：
+        若最早结束的行与当前转录本不重叠则复用该行，否则新建一行（O(n log n)）
+        """
+        # 先取出整数坐标，按 (start, end) 排序（相同时保持原顺序）后依次放置，
+        # 扫描过程中只比较整数，不再访问范围字典
+        items = sorted(
+            (tr['start'], tr['end'], i, transcript_name)
+            for i, (transcript_name, tr) in enumerate(transcript_ranges.items())
+        )
         
-        for transcript_name in transcript_names:
-            transcript_range = transcript_ranges[transcript_name]
-            
-            # 尝试放入现有行
-            placed = False
-            for row_idx, row in enumerate(transcript_rows):
-                # 检查与该行中所有转录本是否重叠
-                overlaps = False
-                for existing_transcript in row:
-                    if transcripts_overlap(transcript_range, transcript_ranges[existing_transcript]):
-                        overlaps = True
-                        break
-                
-                if not overlaps:
-                    row.append(transcript_name)
-                    placed = True
-                    break
-            
-            # 如果无法放入现有行，创建新行
-            if not placed:
+        transcript_rows = []
+        row_first = []  # 每行中转录本在记录中的最小序号
+        row_ends = []  # 最小堆：(行的结束位置, 行索引)
+        
+        for tr_start, tr_end, i, transcript_name in items:
+            if row_ends and row_ends[0][0] < tr_start:
+                # 最早结束的行与当前转录本不重叠，放入该行
+                _, row_idx = heapq.heappop(row_ends)
+                transcript_rows[row_idx].append(transcript_name)
+                row_first[row_idx] = min(row_first[row_idx], i)
+            else:
+                # 所有行都与当前转录本重叠，创建新行
+                row_idx = len(transcript_rows)
                 transcript_rows.append([transcript_name])
+                row_first.append(i)
+            heapq.heappush(row_ends, (tr_end, row_idx))
         
-        return transcript_rows
+        # 行的分配需要按起始位置扫描，但显示时按记录中的顺序排列各行
+        return [row for _, row in sorted(zip(row_first, transcript_rows))]
     
     def draw_transcript_row(self, ax, transcript_row, transcript_ranges, transcripts, record, start_pos, region_len=None):
         """
@@ -234,50 +280,70 @@ class FootprintVisualizer:
         - start_pos: 区域起始位置（用于坐标转换）
         - region_len: 区域长度
         """
-        # 为每个转录本分配独特的基础颜色
-        transcript_names = list(transcript_ranges.keys())
-        transcript_base_colors = plt.cm.Set3(np.linspace(0, 1, len(transcript_names)))
-        transcript_color_map = dict(zip(transcript_names, transcript_base_colors))
+        n_components = sum(len(transcript_ranges[name]['components']) for name in transcript_row)
+        if n_components > _DENSE_ROW_COMPONENTS:
+            # 组件过多时箭头和组件标签已无法分辨，改为批量绘制组件矩形
+            y_center, label_offset = self._draw_component_rectangles(ax, transcript_row, transcript_ranges)
+        else:
+            y_center, label_offset = self._draw_graphic_features(ax, transcript_row, transcript_ranges, record)
+        
+        # 添加转录本内部组件之间的虚线连接（居中到 y_center）
+        self._add_intron_connections(ax, transcript_row, transcript_ranges, transcripts, 0, y_center=y_center)  # 使用相对坐标
+        
+        # 在每个转录本的范围中心添加名称标注
+        for transcript_name in transcript_row:
+            tr = transcript_ranges[transcript_name]
+            mid = (tr['start'] + tr['end']) / 2  # 使用相对坐标
+            ax.text(mid, y_center + label_offset, transcript_name, fontsize=8, ha='center', va='bottom')
+        
+        # 轴范围（使用相对坐标）
+        if region_len is None:
+            actual_end = len(record.seq)
+        else:
+            actual_end = region_len
+        ax.set_xlim(0, actual_end)
         
+        # 调整y轴刻度样式（不再使用y轴标签，以免与文本标注重复）
+        ax.tick_params(axis='y', labelsize=8)
+    
+    def _draw_graphic_features(self, ax, transcript_row, transcript_ranges, record):
+        """
+        使用GraphicRecord绘制一行转录本的各个组件（带方向箭头和组件标签）
+        
+        返回:
+        - (y_center, label_offset): 该行的中线位置，以及转录本名称相对中线的偏移
+        """
+        # 循环中使用局部变量，避免每个组件重复查找全局名称和属性
+        graphic_feature = GraphicFeature
+        get_color = self.component_colors.get
         graphic_features = []
         
         for transcript_name in transcript_row:
-            transcript_range = transcript_ranges[transcript_name]
-            components = transcript_range['components']
+            components = transcript_ranges[transcript_name]['components']
             
             # 判断是否为多组件转录本
             if len(components) > 1:
-                # 多组件转录本：仅绘制各个组件，不绘制整体背景框与描边
-                for comp in components:
-                    comp_color = self.component_colors.get(comp['component_type'], "#CCCCCC")
-                    graphic_features.append(GraphicFeature(
-                        start=comp['start'],  # 使用相对坐标
-                        end=comp['end'],      # 使用相对坐标
-                        strand=comp['strand'],
-                        color=comp_color,
-                        label=f"{comp['component_type']}",
-                        thickness=12,
-                        linewidth=1
-                    ))
+                # 多组件转录本：仅绘制各个组件，不绘制整体背景框与描边（使用相对坐标）
+                graphic_features.extend([
+                    graphic_feature(
+                        start=comp.start, end=comp.end, strand=comp.strand,
+                        color=get_color(comp.component_type, "#CCCCCC"),
+                        label=comp.component_type,
+                        thickness=12, linewidth=1
+                    )
+                    for comp in components
+                ])
             else:
-                # 单组件特征：直接显示
+                # 单组件特征：直接显示（使用相对坐标）
                 comp = components[0]
-                comp_color = self.component_colors.get(comp['component_type'], "#CCCCCC")
-                
-                graphic_features.append(GraphicFeature(
-                    start=comp['start'],  # 使用相对坐标
-                    end=comp['end'],      # 使用相对坐标
-                    strand=comp['strand'],
-                    color=comp_color,
-                    label=f"{transcript_name}",
+                graphic_features.append(graphic_feature(
+                    start=comp.start, end=comp.end, strand=comp.strand,
+                    color=get_color(comp.component_type, "#CCCCCC"),
+                    label=transcript_name,
                     thickness=15
                 ))
         
         # 创建并绘制图形记录
-        if region_len is None:
-            actual_end = len(record.seq)
-        else:
-            actual_end = region_len
         graphic_record = GraphicRecord(
             sequence_length=len(record.seq),
             features=graphic_features
@@ -289,22 +355,37 @@ class FootprintVisualizer:
         
         # 计算当前行的中线位置（与绘制时的 level_offset 对齐）
         y_center = graphic_record.feature_level_height * level_offset
-        
-        # 添加转录本内部组件之间的虚线连接（居中到 y_center）
-        self._add_intron_connections(ax, transcript_row, transcript_ranges, transcripts, 0, y_center=y_center)  # 使用相对坐标
-        
-        # 在每个转录本的范围中心添加名称标注
         label_offset = 0.6 * graphic_record.feature_level_height
-        for transcript_name in transcript_row:
-            tr = transcript_ranges[transcript_name]
-            mid = (tr['start'] + tr['end']) / 2  # 使用相对坐标
-            ax.text(mid, y_center + label_offset, transcript_name, fontsize=8, ha='center', va='bottom')
-        
-        # 轴范围（使用相对坐标）
-        ax.set_xlim(0, actual_end)
+        return y_center, label_offset
+    
+    def _draw_component_rectangles(self, ax, transcript_row, transcript_ranges):
+        """
+        将一行中所有转录本的组件作为矩形放入一个PatchCollection绘制
+        （不绘制方向箭头和组件标签），用于组件数量很多的行
         
-        # 调整y轴刻度样式（不再使用y轴标签，以免与文本标注重复）
-        ax.tick_params(axis='y', labelsize=8)
+        返回:
+        - (y_center, label_offset): 该行的中线位置，以及转录本名称相对中线的偏移
+        """
+        get_color = self.component_colors.get
+        components = [
+            comp for transcript_name in transcript_row
+            for comp in transcript_ranges[transcript_name]['components']
+        ]
+        
+        half_height = 0.25
+        ax.add_collection(PatchCollection(
+            [
+                Rectangle((comp.start, -half_height), comp.end - comp.start, 2 * half_height)
+                for comp in components
+            ],
+            facecolors=[get_color(comp.component_type, "#CCCCCC") for comp in components],
+            edgecolors='none'  # 矩形很窄，描边会盖住填充色
+        ))
+        
+        # 与GraphicRecord.plot一致，不显示坐标轴
+        ax.set_ylim(-1, 1)
+        ax.axis('off')
+        return 0.0, 0.4
     
     def _add_intron_connections(self, ax, transcript_row, transcript_ranges, transcripts, start_pos, y_center=0.0):
         """
@@ -318,14 +399,15 @@ class FootprintVisualizer:
         - start_pos: 区域起始位置
         """
         
+        introns = []  # 所有内含子的 (起始, 结束)，最后统一绘制
         for transcript_name in transcript_row:
             transcript_range = transcript_ranges[transcript_name]
             components = transcript_range['components']
             
             # 只为多组件转录本绘制连接线
             if len(components) > 1:
-                # 按基因组位置排序组件
-                sorted_components = sorted(components, key=lambda x: x['start'])
+                # 组件在create_transcript_layout_visualization中已按基因组位置排序
+                sorted_components = components
                 
                 # 使用给定的居中线 y_center
                 
@@ -335,93 +417,76 @@ class FootprintVisualizer:
                     next_comp = sorted_components[i + 1]
                     
                     # 计算连接线的起始和结束位置（使用相对坐标）
-                    line_start = current_comp['end']
-                    line_end = next_comp['start']
+                    line_start = current_comp.end
+                    line_end = next_comp.start
                     
                     # 只在有间隔的情况下绘制连接线
                     if line_end > line_start:
-                        # 绘制虚线连接
-                        ax.plot([line_start, line_end], [y_center, y_center], 
-                                linestyle='--', 
-                                color='gray', 
-                                alpha=0.6, 
-                                linewidth=1.5,
-                                zorder=-1)  # 置于特征之下，避免覆盖
-                        
-                        # 可选：在连接线中点添加小标记表示内含子
-                        intron_center = (line_start + line_end) / 2
-                        ax.plot([intron_center], [y_center], 
-                                marker='|', 
-                                color='gray', 
-                                alpha=0.8, 
-                                markersize=6,
-                                zorder=0)
+                        introns.append((line_start, line_end))
+        
+        self._draw_intron_lines(ax, introns, y_center)
     
-    def _add_intron_connections_simple(self, ax, record, start_pos, y_center=0.0):
+    def _add_intron_connections_simple(self, ax, transcripts, start_pos, y_center=0.0):
         """
         为简单布局（单行）添加转录本内部的虚线连接
         
         参数:
         - ax: matplotlib轴对象
-        - record: GenBank记录对象
+        - transcripts: create_transcript_layout_visualization返回的转录本数据字典
+          （组件已按基因组位置排序）
         - start_pos: 区域起始位置
         """
         
-        # 按转录本分组特征
-        transcripts = {}
-        for feature in record.features:
-            if 'label' in feature.qualifiers:
-                label = feature.qualifiers['label'][0]
-                if '-' in label:
-                    transcript_name = label.split('-')[0]
-                    
-                    if transcript_name not in transcripts:
-                        transcripts[transcript_name] = []
-                    
-                    transcripts[transcript_name].append({
-                        'start': int(feature.location.start),
-                        'end': int(feature.location.end),
-                        'type': label.split('-')[1] if '-' in label else feature.type,
-                        'strand': feature.location.strand
-                    })
-        
-        # 为每个转录本绘制连接线
-        for transcript_name, components in transcripts.items():
-            if len(components) > 1:
-                # 按基因组位置排序组件
-                sorted_components = sorted(components, key=lambda x: x['start'])
+        # 为每个转录本收集连接线，最后统一绘制
+        introns = []
+        for components in transcripts.values():
+            # 只为多组件转录本绘制连接线，在相邻组件之间绘制虚线
+            for current_comp, next_comp in zip(components, components[1:]):
+                # 计算连接线的起始和结束位置（使用相对坐标）
+                line_start = current_comp.end
+                line_end = next_comp.start
                 
-                # 使用给定的居中线 y_center
-                
-                # 在相邻组件之间绘制虚线
-                for i in range(len(sorted_components) - 1):
-                    current_comp = sorted_components[i]
-                    next_comp = sorted_components[i + 1]
-                    
-                    # 计算连接线的起始和结束位置（使用相对坐标）
-                    line_start = current_comp['end']
-                    line_end = next_comp['start']
-                    
-                    # 只在有间隔的情况下绘制连接线
-                    if line_end > line_start:
-                        # 绘制虚线连接
-                        ax.plot([line_start, line_end], [y_center, y_center], 
-                                linestyle='--', 
-                                color='gray', 
-                                alpha=0.6, 
-                                linewidth=1.5,
-                                zorder=-1)
-                        
-                        # 在连接线中点添加小标记表示内含子
-                        intron_center = (line_start + line_end) / 2
-                        ax.plot([intron_center], [y_center], 
-                                marker='|', 
-                                color='gray', 
-                                alpha=0.8, 
-                                markersize=6,
-                                zorder=0)
+                # 只在有间隔的情况下绘制连接线
+                if line_end > line_start:
+                    introns.append((line_start, line_end))
+        
+        self._draw_intron_lines(ax, introns, y_center)
+    
+    def _draw_intron_lines(self, ax, introns, y_center):
+        """
+        将所有内含子虚线合并为一个LineCollection绘制，并在各连接线中点添加小标记
+        
+        参数:
+        - ax: matplotlib轴对象
+        - introns: 内含子 (起始, 结束) 列表
+        - y_center: 连接线的y坐标
+        """
+        if not introns:
+            return
+        
+        segments = [[(line_start, y_center), (line_end, y_center)] for line_start, line_end in introns]
+        ax.add_collection(LineCollection(
+            segments,
+            linestyles='--',
+            colors='gray',
+            alpha=0.6,
+            linewidths=1.5,
+            zorder=-1  # 置于特征之下，避免覆盖
+        ))
+        
+        # 在连接线中点添加小标记表示内含子
+        intron_centers = [(line_start + line_end) / 2 for line_start, line_end in introns]
+        ax.scatter(
+            intron_centers, [y_center] * len(intron_centers),
+            marker='|',
+            c='gray',
+            alpha=0.8,
+            s=36,  # markersize=6
+            zorder=0
+        )
     
-    def plot_heatmap(self, ax, heatmap_data, radii, seq_len, max_score, start_pos, title="", vmin=None, vmax=None):
+    def plot_heatmap(self, ax, heatmap_data, radii, seq_len, max_score, start_pos, title="", vmin=None, vmax=None,
+                     dpi=None):
         """
         绘制footprint分数热图
         
@@ -433,11 +498,18 @@ class FootprintVisualizer:
         - max_score: 最大分数值
         - start_pos: 区域起始位置（用于x轴坐标转换）
         - title: 图表标题（已弃用，不再显示标题）
+        - dpi: 输出分辨率，用于决定热图最多保留的列数；为None时使用画布的dpi
         """
         # 计算实际基因组坐标范围
         actual_start = start_pos
         actual_end = start_pos + seq_len
         
+        # 列数超过画布宽度对应像素数的2倍时按列分箱，extent不变，坐标仍然对齐
+        if dpi is None:
+            dpi = ax.figure.dpi
+        max_cols = int(ax.figure.get_size_inches()[0] * dpi * 2)
+        heatmap_data = _pool_heatmap_columns(heatmap_data, max_cols)
+        
         # 允许自定义色阶范围；默认与原行为一致
         _vmin = 0 if vmin is None else vmin
         _vmax = max_score if vmax is None else vmax
@@ -451,6 +523,8 @@ class FootprintVisualizer:
             cmap=plt.cm.Blues,
             vmin=_vmin, vmax=_vmax
         )
+        # 输出PDF/SVG时将热图栅格化（按savefig的dpi），坐标轴和文字仍保持矢量
+        im.set_rasterized(True)
         
         ax.set_xlim(actual_start, actual_end)
         ax.set_ylabel("FootPrint Size (bp)")
@@ -481,14 +555,34 @@ class FootprintVisualizer:
         - start: 区域起始位置
         - seq_len: 序列长度
         """
-        if highlight_regions:
-            for region_start, region_end in highlight_regions:
-                # 使用实际基因组坐标，限制在当前区域范围内
-                actual_start = max(start, region_start)
-                actual_end = min(start + seq_len, region_end)
-                
-                # 只有当高亮区域与当前区域有重叠时才绘制
-                if actual_start < actual_end:
-                    # 在所有轴上添加高亮
-                    for ax in axes:
-                        ax.axvspan(actual_start, actual_end, color="red", alpha=0.3, linewidth=0.5)
+        if not highlight_regions:
+            return
+        
+        # 使用实际基因组坐标，一次性将所有高亮区域限制在当前区域范围内
+        regions = np.asarray(highlight_regions, dtype=float).reshape(-1, 2)
+        actual_starts = np.maximum(regions[:, 0], start)
+        actual_ends = np.minimum(regions[:, 1], start + seq_len)
+        
+        # 只保留与当前区域有重叠的高亮区域
+        overlap = actual_starts < actual_ends
+        if not overlap.any():
+            return
+        
+        # 每个区域为一个纵向贯穿整个轴的矩形（x为数据坐标，y为轴坐标0~1）
+        verts = [
+            [(s, 0), (s, 1), (e, 1), (e, 0)]
+            for s, e in zip(actual_starts[overlap].tolist(), actual_ends[overlap].tolist())
+        ]
+        
+        # 在所有轴上添加高亮，每个轴只添加一个集合对象
+        for ax in axes:
+            highlights = PolyCollection(
+                verts,
+                facecolors="red",
+                edgecolors="red",
+                alpha=0.3,
+                linewidths=0.5,
+                transform=ax.get_xaxis_transform()
+            )
+            highlights.set_rasterized(True)
+            ax.add_collection(highlights, autolim=False)
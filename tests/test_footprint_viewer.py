@@ -0,0 +1,297 @@
+"""Tests for FootprintViewer."""
+
+import os
+import random
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+import pytest
+from Bio.Seq import Seq
+from Bio.SeqRecord import SeqRecord
+from matplotlib.collections import PatchCollection
+from matplotlib.colors import to_rgba
+
+from dna_features_viewer.FootprintViewer import (
+    FootprintDataProcessor,
+    FootprintVisualizer,
+    GenBankCreator,
+)
+from dna_features_viewer.FootprintViewer import data_processor
+from dna_features_viewer.FootprintViewer.visualizer import (
+    TranscriptComponent,
+    _pool_heatmap_columns,
+)
+
+example_gff3 = os.path.join(
+    "examples", "FootprintViewer", "data", "arabidopsis_test.gff3"
+)
+
+
+def write_nested_gff3(path):
+    """Write a GFF3 with long features enclosing many short, unsorted ones."""
+    rng = random.Random(0)
+    lines = ["##gff-version 3"]
+    for t in range(20):
+        start = rng.randint(1, 50000)
+        end = start + rng.choice([50, 500, 20000])  # some transcripts span the others
+        lines.append("ChrN\t.\tmRNA\t%d\t%d\t.\t+\t.\tID=t%d;Name=T%d" % (start, end, t, t))
+        for _ in range(rng.randint(1, 6)):
+            s = rng.randint(start, end)
+            e = rng.randint(s, end)
+            ftype = rng.choice(["CDS", "five_prime_UTR", "three_prime_UTR", "exon"])
+            lines.append("ChrN\t.\t%s\t%d\t%d\t.\t-\t.\tParent=t%d" % (ftype, s, e, t))
+    body = lines[1:]
+    rng.shuffle(body)
+    lines[1:] = body
+    with open(path, "w") as f:
+        f.write("\n".join(lines) + "\n")
+
+
+def brute_force_features(gff3_file, chrom, start, end, target_types):
+    """Scan every line and keep the target features that overlap the region."""
+    expected = []
+    with open(gff3_file) as f:
+        for line in f:
+            parts = line.rstrip("\n").split("\t")
+            if line.startswith("#") or len(parts) < 9:
+                continue
+            if parts[0] != chrom or parts[2] not in target_types:
+                continue
+            feat_start, feat_end = int(parts[3]), int(parts[4])
+            if feat_start > end or feat_end < start:
+                continue
+            relative_start = max(0, feat_start - start)
+            relative_end = min(end - start + 1, feat_end - start + 1)
+            if relative_end > relative_start:
+                expected.append((parts[2], relative_start, relative_end))
+    return expected
+
+
+def check_region_lookup(gff3_file, regions):
+    creator = GenBankCreator()
+    for chrom, start, end in regions:
+        features = creator._parse_gff3_features(gff3_file, chrom, start, end)
+        found = [
+            (f.type, int(f.location.start), int(f.location.end)) for f in features
+        ]
+        expected = brute_force_features(
+            gff3_file, chrom, start, end, creator.target_feature_types
+        )
+        assert found == expected, (chrom, start, end)
+
+
+def test_gff3_region_lookup_example():
+    rng = random.Random(1)
+    regions = [("Chr1", 1, 1000), ("Chr4", 18487724, 18489875)]
+    for _ in range(100):
+        chrom = rng.choice(["Chr4", "Chr5"])
+        base = 18487000 if chrom == "Chr4" else 21582000
+        start = base + rng.randint(-2000, 12000)
+        regions.append((chrom, start, start + rng.randint(0, 6000)))
+    check_region_lookup(example_gff3, regions)
+
+
+def test_gff3_region_lookup_nested(tmpdir):
+    gff3_file = os.path.join(str(tmpdir), "nested.gff3")
+    write_nested_gff3(gff3_file)
+    rng = random.Random(2)
+    regions = []
+    for _ in range(200):
+        start = rng.randint(1, 75000)
+        regions.append(("ChrN", start, start + rng.choice([0, 10, 300, 5000])))
+    check_region_lookup(gff3_file, regions)
+
+
+EDGE_CASE_GFF3 = "\n".join([
+    "##gff-version 3",
+    "#!comment line",
+    "NA\tsrc\tgene\t100\t900\t.\t+\t.\tID=g1#x;Name=G1",
+    "NA\tsrc\tmRNA\t100\t900\t.\t+\t.\tID=t1;Name=tRNA-Ala;Parent=g1#x;Note=a#b",
+    "NA\tsrc\tCDS\t150\t300\t.\t+\t0\tID=c1;Parent=t1",
+    "NA\tsrc\tfive_prime_UTR\t100\t149\t.\t+\t.\tParent=t1",
+    "NA\tsrc\tthree_prime_UTR\t500\t900\t.\t+\t.\tParent=t1",
+    "NA\t.\tCDS\t60\t90\t.\t+",  # truncated line without attributes
+    "NA\t.\tCDS\t60\t90\t.\t+\t.\t",  # empty attributes
+    "null\tsrc\tCDS\t10\t20\t.\t-\t0\tParent=x",
+    "###",
+    "NA\tsrc\tCDS\tbad\t20\t.\t-\t0\tParent=x",
+]) + "\n"
+
+
+def test_gff3_edge_cases(tmpdir):
+    gff3_file = os.path.join(str(tmpdir), "edge_cases.gff3")
+    with open(gff3_file, "w") as f:
+        f.write(EDGE_CASE_GFF3)
+    creator = GenBankCreator()
+
+    def parse(chrom):
+        return [
+            (f.type, int(f.location.start), int(f.location.end), f.qualifiers["label"][0])
+            for f in creator._parse_gff3_features(gff3_file, chrom, 1, 1000)
+        ]
+
+    # 'NA' and 'null' are seqids, '#' inside attributes is kept, and lines
+    # that are truncated or have invalid coordinates are skipped
+    assert parse("NA") == [
+        ("CDS", 149, 300, "tRNA-Ala-CDS"),
+        ("five_prime_UTR", 99, 149, "tRNA-Ala-5UTR"),
+        ("three_prime_UTR", 499, 900, "tRNA-Ala-3UTR"),
+    ]
+    assert parse("null") == [("CDS", 9, 20, "x-CDS")]
+
+
+def test_arrange_transcript_rows():
+    rng = random.Random(3)
+    visualizer = FootprintVisualizer()
+    for _ in range(50):
+        transcript_ranges = {}
+        for i in range(rng.randint(1, 40)):
+            start = rng.randint(0, 1000)
+            end = start + rng.randint(0, 300)
+            transcript_ranges["t%d" % i] = {"start": start, "end": end}
+        rows = visualizer._arrange_transcript_rows(transcript_ranges)
+
+        # Every transcript is placed exactly once
+        placed = [name for row in rows for name in row]
+        assert sorted(placed) == sorted(transcript_ranges)
+
+        # No two transcripts in a row overlap (coordinates are inclusive)
+        for row in rows:
+            spans = sorted((transcript_ranges[n]["start"], transcript_ranges[n]["end"]) for n in row)
+            for (_, end), (next_start, _) in zip(spans, spans[1:]):
+                assert end < next_start
+
+        # The row count equals the maximum number of transcripts covering one position
+        depth = max(
+            sum(r["start"] <= r0["start"] <= r["end"] for r in transcript_ranges.values())
+            for r0 in transcript_ranges.values()
+        )
+        assert len(rows) == depth
+
+        # Rows are listed in record order of their first transcript
+        names = list(transcript_ranges)
+        firsts = [min(names.index(n) for n in row) for row in rows]
+        assert firsts == sorted(firsts)
+
+
+def test_dense_row_keeps_component_colors():
+    visualizer = FootprintVisualizer()
+    types = ["5UTR", "CDS", "3UTR"]
+    components = [
+        TranscriptComponent(None, types[i % 3], 10 * i, 10 * i + 5, 1, "t-%s" % types[i % 3])
+        for i in range(600)
+    ]
+    transcript_ranges = {"t": {"start": 0, "end": 5995, "components": components}}
+    record = SeqRecord(Seq("A" * 6000))
+
+    fig, ax = plt.subplots()
+    visualizer.draw_transcript_row(ax, ["t"], transcript_ranges, {}, record, 0)
+    collections = [c for c in ax.collections if isinstance(c, PatchCollection)]
+    assert len(collections) == 1
+    expected = [to_rgba(visualizer.component_colors[comp.component_type]) for comp in components]
+    assert [tuple(c) for c in collections[0].get_facecolor()] == expected
+    assert len(collections[0].get_edgecolor()) == 0
+    plt.close(fig)
+
+
+def test_pool_heatmap_columns_ignores_nan():
+    data = np.array([[1.0, np.nan, 3.0, np.nan, np.nan, 0.5, 2.0]])
+    pooled = _pool_heatmap_columns(data, 3)
+    np.testing.assert_array_equal(pooled, [[3.0, 0.5, 2.0]])
+    assert _pool_heatmap_columns(data, 7) is data
+
+
+def test_highlight_regions_keep_float_bounds():
+    visualizer = FootprintVisualizer()
+    fig, axes = plt.subplots(2)
+    visualizer.add_highlight_regions(axes, [(10.5, 20.25), (5, 8), (200, 300)], 0, 100)
+    for ax in axes:
+        (collection,) = ax.collections
+        xs = [sorted(set(path.vertices[:, 0])) for path in collection.get_paths()]
+        assert xs == [[10.5, 20.25], [5.0, 8.0]]
+    plt.close(fig)
+
+
+def naive_heatmap(fp_data, start, end, radius_range):
+    """Fill the heatmap row by row, as the original iterrows loop did."""
+    radii = range(radius_range[0], radius_range[1] + 1)
+    heatmap = np.zeros((len(radii), end - start + 1))
+    for row in fp_data.to_dict("records"):
+        pos_idx = int(row["pos"]) - start
+        if not 0 <= pos_idx < heatmap.shape[1]:
+            continue
+        if "radius" in row:
+            radius_idx = int(row["radius"]) - radius_range[0]
+            if 0 <= radius_idx < len(radii):
+                heatmap[radius_idx, pos_idx] = row["score"]
+        else:
+            for radius_idx, radius in enumerate(radii):
+                score = row.get("r%d" % radius)
+                if score is not None and not np.isnan(score):
+                    heatmap[radius_idx, pos_idx] = score
+    return heatmap
+
+
+def check_heatmap(fp_data, start, end, radius_range):
+    processor = FootprintDataProcessor()
+    heatmap, positions, radii = processor.create_heatmap_data(
+        fp_data, start, end, radius_range
+    )
+    expected = naive_heatmap(fp_data, start, end, radius_range)
+    np.testing.assert_array_equal(heatmap, expected.astype(np.float32))
+    np.testing.assert_array_equal(positions, np.arange(start, end + 1))
+    np.testing.assert_array_equal(radii, np.arange(radius_range[0], radius_range[1] + 1))
+
+
+def make_wide_data(rng, positions, radii):
+    scores = rng.random((len(positions), len(radii))).astype(np.float32)
+    scores[rng.random(scores.shape) < 0.1] = np.nan
+    fp_data = pd.DataFrame(scores, columns=["r%d" % r for r in radii])
+    fp_data.insert(0, "pos", positions)
+    fp_data.insert(0, "chrom", "Chr1")
+    return fp_data
+
+
+def test_create_heatmap_data_wide():
+    rng = np.random.default_rng(4)
+    start, end = 1000, 1199
+
+    # Contiguous, sorted positions with every radius column
+    fp_data = make_wide_data(rng, np.arange(start, end + 1), range(2, 101))
+    check_heatmap(fp_data, start, end, (2, 100))
+
+    # Gapped, unsorted positions, some outside the region, a missing r7 column
+    # and radius columns outside radius_range
+    positions = rng.choice(np.arange(start - 50, end + 50), size=150, replace=False)
+    radii = [r for r in range(2, 31) if r != 7]
+    fp_data = make_wide_data(rng, positions, radii)
+    check_heatmap(fp_data, start, end, (3, 20))
+
+
+def make_long_data(rng, start, end, radius_range, size):
+    positions = np.arange(start - 20, end + 21)
+    radii = np.arange(radius_range[0] - 2, radius_range[1] + 3)
+    # Unique (pos, radius) pairs in random order, some outside the heatmap
+    pairs = rng.choice(len(positions) * len(radii), size=size, replace=False)
+    return pd.DataFrame({
+        "chrom": "Chr1",
+        "pos": positions[pairs // len(radii)],
+        "radius": radii[pairs % len(radii)],
+        "score": rng.random(size).astype(np.float32),
+    })
+
+
+def test_create_heatmap_data_long_numba():
+    pytest.importorskip("numba")
+    assert data_processor._get_scatter_long() is not None
+    rng = np.random.default_rng(5)
+    fp_data = make_long_data(rng, 500, 699, (2, 30), 2000)
+    check_heatmap(fp_data, 500, 699, (2, 30))
+
+
+def test_create_heatmap_data_long_numpy(monkeypatch):
+    monkeypatch.setattr(data_processor, "_get_scatter_long", lambda: None)
+    rng = np.random.default_rng(5)
+    fp_data = make_long_data(rng, 500, 699, (2, 30), 2000)
+    check_heatmap(fp_data, 500, 699, (2, 30))